@@ -1,25 +1,100 @@
 import json
 import os
-from tempfile import mkstemp
+from copy import deepcopy
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import monotonic
 
 import requests
-from typing import Union, Any, Optional
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from typing import Union, Any, Optional, List
+from globus_sdk import GlobusAPIError
 from globus_sdk.base import BaseClient, slash_join
+from globus_sdk.response import GlobusHTTPResponse
 from mdf_toolbox import login, logout
 from mdf_toolbox.search_helper import SEARCH_LIMIT
 
 from funcx.sdk.client import FuncXClient
 from funcx.serialize import FuncXSerializer
+from funcx.serialize.concretes import pickle_base64
 
 from dlhub_sdk.config import DLHUB_SERVICE_ADDRESS, CLIENT_ID
+from dlhub_sdk.utils.cache import load_cached_record, save_cached_record, remove_cached_records
 from dlhub_sdk.utils.futures import DLHubFuture
 from dlhub_sdk.utils.schemas import validate_against_dlhub_schema
 from dlhub_sdk.utils.search import DLHubSearchHelper, get_method_details, filter_latest
 
 
+try:
+    # orjson is optional, but encodes JSON much faster than the standard library
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Serializer for servable inputs, shared by all clients
+_input_serializer = pickle_base64()
+
+# Servables are invoked without keyword arguments, so their serialized form never changes
+_empty_kwargs = _input_serializer.serialize({})
+
 # Directory for authentication tokens
 _token_dir = os.path.expanduser("~/.dlhub/credentials")
 
+# Directory for servable descriptions saved between sessions
+_describe_cache_dir = os.path.expanduser("~/.dlhub/describe_cache")
+
+# Client shared by all callers of DLHubClient.get_default
+_default_client = None
+_default_client_lock = Lock()
+
+
+def _dumps_json(obj):
+    """Serialize an object to JSON, using orjson if it is installed
+
+    Args:
+        obj: Object to be serialized
+    Returns:
+        (bytes) JSON-encoded object
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter than json (e.g., it requires string keys)
+            pass
+    return json.dumps(obj).encode()
+
+
+def _loads_json(content):
+    """Parse a JSON document, using orjson if it is installed
+
+    Args:
+        content (bytes or str): JSON document
+    Returns:
+        Parsed document
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class DLHubResponse(GlobusHTTPResponse):
+    """Response from the DLHub service
+
+    Parses the JSON body only once, rather than on each access to ``data``"""
+
+    @property
+    def data(self):
+        if not hasattr(self, '_parsed_data'):
+            try:
+                self._parsed_data = _loads_json(self._data.content)
+            except ValueError:
+                # As in GlobusHTTPResponse, the data is ``None`` if the body is not JSON
+                self._parsed_data = None
+        return self._parsed_data
+
 
 class DLHubClient(BaseClient):
     """Main class for interacting with the DLHub service
@@ -35,8 +110,11 @@ class DLHubClient(BaseClient):
     `tutorial for the Globus SDK <https://globus-sdk-python.readthedocs.io/en/stable/tutorial/>`_
     and providing that authorizer to the initializer (e.g., ``DLHubClient(auth)``)"""
 
+    default_response_class = DLHubResponse
+
     def __init__(self, dlh_authorizer=None, search_client=None, http_timeout=None,
-                 force_login=False, fx_authorizer=None, **kwargs):
+                 force_login=False, fx_authorizer=None, cache_ttl=300,
+                 cache_dir=_describe_cache_dir, **kwargs):
         """Initialize the client
 
         Args:
@@ -63,6 +141,12 @@ class DLHubClient(BaseClient):
             no_browser (bool): Do not automatically open the browser for the Globus Auth URL.
                 Display the URL instead and let the user navigate to that location manually.
                 **Default**: ``True``.
+            cache_ttl (float): How long to reuse the results of servable lookups
+                (e.g., :meth:`get_servables`, :meth:`describe_servable`) in seconds.
+                Set to 0 to disable caching. **Default**: ``300``.
+            cache_dir (str): Directory in which to save servable descriptions so that they
+                are reused by later sessions. Set to ``None`` to disable saving to disk.
+                **Default**: ``~/.dlhub/describe_cache``.
         Keyword arguments are the same as for BaseClient.
         """
         if force_login or not dlh_authorizer or not search_client or not fx_authorizer:
@@ -91,14 +175,84 @@ class DLHubClient(BaseClient):
         # self.fx_endpoint = '2c92a06a-015d-4bfa-924c-b3d0c36bdad7'
         self.fx_serializer = FuncXSerializer()
         self.fx_cache = {}
+
+        # Cache of recent servable lookups, maps key -> (time of lookup, result)
+        self.cache_ttl = cache_ttl
+        self.cache_dir = cache_dir
+        self._search_cache = {}
+
+        # Session used for requests made outside of the Globus client (e.g., file uploads)
+        #  Reusing it keeps the connection to DLHub open between calls
+        self._requests_session = requests.Session()
+        self._requests_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
         super(DLHubClient, self).__init__("DLHub", environment='dlhub', authorizer=dlh_authorizer,
                                           http_timeout=http_timeout, base_url=DLHUB_SERVICE_ADDRESS,
                                           **kwargs)
 
+    @classmethod
+    def get_default(cls, **kwargs):
+        """Get a client shared by the whole process, creating it on the first call
+
+        Creating a client requires logging in and starts new connections to DLHub,
+        so applications that make many calls (e.g., from many worker threads)
+        should reuse this client rather than creating their own.
+
+        Keyword arguments are passed to the initializer, and are only used on the first call.
+
+        Returns:
+            (DLHubClient): Shared client
+        """
+        global _default_client
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = cls(**kwargs)
+            return _default_client
+
     def logout(self):
         """Remove credentials from your local system"""
         logout()
 
+    def get_session(self):
+        """Get the session used for direct HTTP requests to DLHub (e.g., publishing servables)
+
+        Use this to attach retry policies or other adapters to the session
+
+        Returns:
+            (requests.Session): Session shared by all requests made by this client
+        """
+        return self._requests_session
+
+    def _get_cached(self, key, copy=True):
+        """Get a result from the lookup cache
+
+        Args:
+            key (tuple): Key describing the lookup
+            copy (bool): Whether to return a copy of the result, which is safe to modify
+        Returns:
+            Cached result, ``None`` if it is not cached or has expired
+        """
+        entry = self._search_cache.get(key)
+        if entry is None or monotonic() - entry[0] > self.cache_ttl:
+            return None
+        return deepcopy(entry[1]) if copy else entry[1]
+
+    def _set_cached(self, key, value, copy=True):
+        """Store a result in the lookup cache
+
+        Args:
+            key (tuple): Key describing the lookup
+            value: Result of the lookup
+            copy (bool): Whether to store a copy of the result, which is
+                needed if the caller may later modify it
+        """
+        if self.cache_ttl > 0:
+            self._search_cache[key] = (monotonic(), deepcopy(value) if copy else value)
+
+    def invalidate_cache(self):
+        """Remove all servable lookups from the cache"""
+        self._search_cache = {}
+
     @property
     def query(self):
         """Access a query of the DLHub Search repository"""
@@ -119,28 +273,43 @@ class DLHubClient(BaseClient):
             ([list]) Complete metadata for all servables found in DLHub
         """
 
-        # Get all of the servables
+        # Check if we have looked up the servables recently
+        results = self._get_cached(('get_servables', only_latest_version))
+        if results is None:
+            results = self._search_servables(only_latest_version)
+            self._set_cached(('get_servables', only_latest_version), results)
+
+        # Add these to the cache
+        for r in results:
+            self.fx_cache[r['dlhub']['shorthand_name']] = r['dlhub']['funcx_id']
+
+        return results
+
+    def _search_servables(self, only_latest_version):
+        """Query DLHub Search for all servables
+
+        Args:
+            only_latest_version (bool): Whether to only return the latest version of each servable
+        Returns:
+            ([list]) Complete metadata for all servables found in DLHub
+        """
+
+        # Get all of the servables, grouped by owner with the newest versions first
+        #  Sorting by name is not needed to find the latest versions, as all versions
+        #  of a servable share an owner
         results, info = self.query.match_field('dlhub.type', 'servable')\
-            .add_sort('dlhub.owner', ascending=True).add_sort('dlhub.name', ascending=False)\
+            .add_sort('dlhub.owner', ascending=True)\
             .add_sort('dlhub.publication_date', ascending=False).search(info=True)
         if info['total_query_matches'] > SEARCH_LIMIT:
             raise RuntimeError('DLHub contains more servables than we can return in one entry. '
                                'DLHub SDK needs to be updated.')
 
         if only_latest_version:
-            # Sort out only the most recent versions (they come first in the sorted list
-            names = set()
-            output = []
+            # Sort out only the most recent versions (they come first in the sorted list)
+            output = {}
             for r in results:
-                name = r['dlhub']['shorthand_name']
-                if name not in names:
-                    names.add(name)
-                    output.append(r)
-            results = output
-
-        # Add these to the cache
-        for r in results:
-            self.fx_cache[r['dlhub']['shorthand_name']] = r['dlhub']['funcx_id']
+                output.setdefault(r['dlhub']['shorthand_name'], r)
+            results = list(output.values())
 
         return results
 
@@ -166,6 +335,32 @@ class DLHubClient(BaseClient):
         r = self._fx_client.get_task(task_id)
         return r
 
+    def get_task_statuses(self, task_ids):
+        """Get the status of many DLHub tasks with a single request
+
+        Args:
+            task_ids ([string]): UUIDs of the tasks
+        Returns:
+            dict: Map of task ID to status block. Tasks whose status could not be
+            retrieved are omitted. Use :meth:`get_task_status` to get the reason
+        """
+
+        task_ids = list(task_ids)
+        try:
+            return self._fx_client.get_batch_status(task_ids)
+        except GlobusAPIError as e:
+            if e.http_status != 404:
+                raise
+
+        # Fall back to requesting each task separately if there is no batch route
+        statuses = {}
+        for task_id in task_ids:
+            try:
+                statuses[task_id] = self.get_task_status(task_id)
+            except Exception:
+                continue
+        return statuses
+
     def describe_servable(self, name):
         """Get the description for a certain servable
 
@@ -178,14 +373,34 @@ class DLHubClient(BaseClient):
         if len(split_name) < 2:
             raise AttributeError('Please enter name in the form <user>/<servable_name>')
 
+        # Check if we have looked up this servable recently
+        cached = self._get_cached(('describe_servable', name))
+        if cached is not None:
+            return cached
+
+        # Check if a previous session has saved the description to disk
+        owner, servable_name = split_name[0], '/'.join(split_name[1:])
+        if self.cache_dir is not None and self.cache_ttl > 0:
+            cached = load_cached_record(self.cache_dir, owner, servable_name, self.cache_ttl)
+            if cached is not None:
+                self._set_cached(('describe_servable', name), cached)
+                return cached
+
         # Create a query for a single servable
-        query = self.query.match_servable('/'.join(split_name[1:]))\
-            .match_owner(split_name[0]).add_sort("dlhub.publication_date", False)\
+        query = self.query.match_servable(servable_name)\
+            .match_owner(owner).add_sort("dlhub.publication_date", False)\
             .search(limit=1)
 
         # Raise error if servable is not found
         if len(query) == 0:
             raise AttributeError('No such servable: {}'.format(name))
+        self._set_cached(('describe_servable', name), query[0])
+        if self.cache_dir is not None and self.cache_ttl > 0:
+            try:
+                save_cached_record(self.cache_dir, owner, servable_name, query[0])
+            except OSError:
+                # The disk cache is only an optimization
+                pass
         return query[0]
 
     def describe_methods(self, name, method=None):
@@ -199,8 +414,18 @@ class DLHubClient(BaseClient):
                 if the method name was not provided.
         """
 
-        metadata = self.describe_servable(name)
-        return get_method_details(metadata, method)
+        # Get the methods of the servable, indexed by name
+        methods = self._get_cached(('describe_methods', name), copy=False)
+        if methods is None:
+            methods = get_method_details(self.describe_servable(name))
+            self._set_cached(('describe_methods', name), methods, copy=False)
+
+        # If desired, return only a single method
+        if method is not None:
+            if method not in methods:
+                raise ValueError('No such method: {}'.format(method))
+            return deepcopy(methods[method])
+        return deepcopy(methods)
 
     def run(self, name, inputs,
             asynchronous=False, async_wait=5,
@@ -219,18 +444,73 @@ class DLHubClient(BaseClient):
             Results of running the servable. If asynchronous, then a DLHubFuture holding the result
         """
 
+        return self.run_many(name, [inputs], asynchronous=asynchronous,
+                             async_wait=async_wait, timeout=timeout)[0]
+
+    def run_many(self, name, inputs, asynchronous=False, async_wait=5,
+                 timeout: Optional[float] = None,
+                 batch_size: Optional[int] = None) -> List[Union[Any, DLHubFuture]]:
+        """Invoke a DLHub servable on many inputs
+
+        Tasks are submitted to DLHub in batches, which requires far fewer web requests
+        than calling :meth:`run` once for each input.
+
+        Args:
+            name (string): DLHub name of the servable of the form <user>/<servable_name>
+            inputs: Iterable of inputs. The servable is invoked once for each entry
+            asynchronous (bool): Whether to return from the function immediately or
+                wait for the executions to finish.
+            async_wait (float): How many seconds to wait between checking async status
+            timeout (float): How long to wait for each result to return.
+                Only used for synchronous calls
+            batch_size (int): Maximum number of tasks to submit in a single request.
+                **Default**: ``None``, to submit all tasks in one request
+        Returns:
+            ([list]): Results of running the servable on each input, in the same order as
+            ``inputs``. If asynchronous, then a list of DLHubFutures holding the results
+        """
+
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+
         if name not in self.fx_cache:
             # Look it up and add it to the cache, this will raise an exception if not found.
             serv = self.describe_servable(name)
             self.fx_cache.update({name: serv['dlhub']['funcx_id']})
-
         funcx_id = self.fx_cache[name]
-        payload = {'data': inputs}
-        task_id = self._fx_client.run(payload, endpoint_id=self.fx_endpoint, function_id=funcx_id)
 
-        # Return the result
-        future = DLHubFuture(self, task_id, async_wait)
-        return future.result(timeout=timeout) if not asynchronous else future
+        # Submit the tasks in batches
+        inputs = list(inputs)
+        if batch_size is None:
+            batch_size = max(len(inputs), 1)
+        task_ids = []
+        for start in range(0, len(inputs), batch_size):
+            batch = self._fx_client.create_batch()
+            for x in inputs[start:start + batch_size]:
+                batch.tasks.append({'endpoint': self.fx_endpoint,
+                                    'function': funcx_id,
+                                    'payload': self._serialize_inputs(x)})
+            task_ids.extend(self._fx_client.batch_run(batch))
+
+        # Return the results
+        futures = [DLHubFuture(self, task_id, async_wait) for task_id in task_ids]
+        if asynchronous:
+            return futures
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _serialize_inputs(self, inputs):
+        """Serialize the inputs for a servable into a funcX task payload
+
+        Uses pickle directly rather than letting funcX try each of its serialization
+        methods, which would also encode the inputs as JSON only to discard the result.
+
+        Args:
+            inputs: Data to be used as input to the servable
+        Returns:
+            (str): Packed payload for a funcX task
+        """
+        ser_args = _input_serializer.serialize(({'data': inputs},))
+        return self.fx_serializer.pack_buffers([ser_args, _empty_kwargs])
 
     def run_serial(self, servables, inputs, async_wait=5):
         """Invoke each servable in a serial pipeline.
@@ -290,37 +570,42 @@ class DLHubClient(BaseClient):
         # Validate against the servable schema
         validate_against_dlhub_schema(metadata, 'servable')
 
-        # Wipe the fx cache so we don't keep reusing an old servable
+        # Wipe the caches so we don't keep reusing an old servable
         self.clear_funcx_cache()
+        self.invalidate_cache()
 
         # Get the data to be submitted as a ZIP file
-        fp, zip_filename = mkstemp('.zip')
-        os.close(fp)
-        os.unlink(zip_filename)
-        try:
-            model.get_zip_file(zip_filename)
+        with NamedTemporaryFile(suffix='.zip') as zf:
+            model.get_zip_file(zf)
+            zf.seek(0)
 
             # Get the authorization headers
             headers = {}
             self.authorizer.set_authorization_header(headers)
 
             # Submit data to DLHub service
-            with open(zip_filename, 'rb') as zf:
-                reply = requests.post(
-                    slash_join(self.base_url, 'publish'),
-                    headers=headers,
-                    files={
-                        'json': ('dlhub.json', json.dumps(metadata), 'application/json'),
-                        'file': ('servable.zip', zf, 'application/octet-stream')
-                    }
-                )
-
-            # Return the task id
-            if reply.status_code != 200:
-                raise Exception(reply.text)
-            return reply.json()['task_id']
-        finally:
-            os.unlink(zip_filename)
+            #  Streams the ZIP file rather than reading it all into memory
+            body = MultipartEncoder(fields={
+                'json': ('dlhub.json', _dumps_json(metadata), 'application/json'),
+                'file': ('servable.zip', zf, 'application/octet-stream')
+            })
+            headers['Content-Type'] = body.content_type
+            reply = self._requests_session.post(
+                slash_join(self.base_url, 'publish'),
+                headers=headers,
+                data=body
+            )
+
+        # Return the task id
+        if reply.status_code != 200:
+            raise Exception(reply.text)
+        if self.cache_dir is not None:
+            try:
+                remove_cached_records(self.cache_dir, metadata['dlhub']['name'])
+            except OSError:
+                # The disk cache is only an optimization
+                pass
+        return _loads_json(reply.content)['task_id']
 
     def publish_repository(self, repository):
         """Submit a repository to DLHub for publication
@@ -334,8 +619,9 @@ class DLHubClient(BaseClient):
         # Publish to DLHub
         metadata = {"repository": repository}
 
-        # Wipe the fx cache so we don't keep reusing an old servable
+        # Wipe the caches so we don't keep reusing an old servable
         self.clear_funcx_cache()
+        self.invalidate_cache()
 
         response = self.post('publish_repo', json_body=metadata)
 
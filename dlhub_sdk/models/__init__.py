@@ -587,7 +587,8 @@ class BaseMetadataModel:
         directory is "/home" and the files will be stored in the Zip as "a.pkl" and "a/b.dat"
 
         Args:
-            path (string): Path for the ZIP File
+            path (string or file-like): Path for the ZIP File, or a file object opened
+                for writing in binary mode
         Returns:
             (string): Base path for the ZIP file (useful for adjusting the paths of the files
                 included in the metadata model)
@@ -1,3 +1,6 @@
+from functools import lru_cache
+import os
+
 try:
     # Attempt to use regular keras first, as we figure it's installed for a reason
     import keras
@@ -28,6 +31,66 @@ def _detect_backend(output):
     output.add_requirement(my_backend, 'detect')
 
 
+def _load_model(model_path, arch_path=None, custom_objects=None):
+    """Load a Keras model, reusing the last model loaded if its files are unchanged
+
+    Args:
+        model_path (string): Path to the hd5 file that contains the weights and, optionally,
+            the architecture
+        arch_path (string): Path to the file containing the architecture, if not
+            available in the file at :code:`model_path`.
+        custom_objects (dict): Map of layer names to custom layers
+    Returns:
+        (keras.Model) Loaded model
+    """
+    def _file_key(path):
+        if path is None:
+            return None
+        path = os.path.abspath(path)
+        return path, os.path.getmtime(path), os.path.getsize(path)
+
+    custom_key = tuple(sorted(custom_objects.items())) if custom_objects is not None else None
+    return _load_model_cached(_file_key(model_path), _file_key(arch_path), custom_key)
+
+
+@lru_cache(maxsize=1)
+def _load_model_cached(model_key, arch_key, custom_key):
+    """Load a Keras model. Arguments are hashable so that the last result can be cached
+
+    Args:
+        model_key ((string, float, int)): Absolute path, modification time and size of the
+            weights file
+        arch_key ((string, float, int)): Absolute path, modification time and size of the
+            architecture file, or ``None``
+        custom_key (tuple): Sorted items of the custom objects dictionary, or ``None``
+    Returns:
+        (keras.Model) Loaded model
+    """
+    model_path = model_key[0]
+    arch_path = arch_key[0] if arch_key is not None else None
+    custom_objects = dict(custom_key) if custom_key is not None else None
+
+    if arch_path is None:
+        model = keras.models.load_model(model_path, custom_objects=custom_objects)
+    else:
+        if arch_path.endswith('.h5') or arch_path.endswith('.hdf') \
+                or arch_path.endswith('.hdf5') or arch_path.endswith('.hd5'):
+            model = keras.models.load_model(arch_path,
+                                            custom_objects=custom_objects, compile=False)
+        elif arch_path.endswith('.json'):
+            with open(arch_path) as fp:
+                json_string = fp.read()
+            model = keras.models.model_from_json(json_string, custom_objects=custom_objects)
+        elif arch_path.endswith('.yml') or arch_path.endswith('.yaml'):
+            with open(arch_path) as fp:
+                yaml_string = fp.read()
+            model = keras.models.model_from_yaml(yaml_string, custom_objects=custom_objects)
+        else:
+            raise ValueError('File type for architecture not recognized')
+        model.load_weights(model_path)
+    return model
+
+
 class KerasModel(BasePythonServableModel):
     """Servable based on a Keras Model object.
 
@@ -62,24 +125,7 @@ class KerasModel(BasePythonServableModel):
                 output.add_custom_object(k, v)
 
         # Get the model details
-        if arch_path is None:
-            model = keras.models.load_model(model_path, custom_objects=custom_objects)
-        else:
-            if arch_path.endswith('.h5') or arch_path.endswith('.hdf') \
-                    or arch_path.endswith('.hdf5') or arch_path.endswith('.hd5'):
-                model = keras.models.load_model(arch_path,
-                                                custom_objects=custom_objects, compile=False)
-            elif arch_path.endswith('.json'):
-                with open(arch_path) as fp:
-                    json_string = fp.read()
-                model = keras.models.model_from_json(json_string, custom_objects=custom_objects)
-            elif arch_path.endswith('.yml') or arch_path.endswith('.yaml'):
-                with open(arch_path) as fp:
-                    yaml_string = fp.read()
-                model = keras.models.model_from_yaml(yaml_string, custom_objects=custom_objects)
-            else:
-                raise ValueError('File type for architecture not recognized')
-            model.load_weights(model_path)
+        model = _load_model(model_path, arch_path, custom_objects)
 
         # Get the inputs of the model
         output['servable']['methods']['run']['input'] = output.format_layer_spec(model.input_shape)
@@ -89,12 +135,9 @@ class KerasModel(BasePythonServableModel):
             output['servable']['methods']['run']['method_details']['classes'] = output_names
 
         # Get a full description of the model. Limit summary to _summary_limit in length
-        output.summary = ""
-
-        def capture_summary(x):
-            output.summary += x + "\n"
-
-        model.summary(print_fn=capture_summary)
+        summary_lines = []
+        model.summary(print_fn=summary_lines.append)
+        output.summary = "".join(line + "\n" for line in summary_lines)
         output.summary = (output.summary[:_summary_limit] + '<<TRUNCATED>>') \
             if len(output.summary) > _summary_limit else output.summary
 
@@ -6,11 +6,16 @@ import os
 try:
     import keras
 except ImportError:
-    from tensorflow import keras
-from unittest import TestCase
+    try:
+        from tensorflow import keras
+    except ImportError:
+        keras = None
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
-from dlhub_sdk.models.servables.keras import KerasModel
 from dlhub_sdk.utils.schemas import validate_against_dlhub_schema
+if keras is not None:
+    from dlhub_sdk.models.servables.keras import KerasModel
 
 
 _year = str(datetime.now().year)
@@ -24,6 +29,7 @@ def _make_simple_model():
     return model
 
 
+@skipIf(keras is None, 'Keras is not installed')
 class TestKeras(TestCase):
 
     maxDiff = 4096
@@ -146,3 +152,35 @@ class TestKeras(TestCase):
             KerasModel.create_model(weights_path, ['y'], arch_path=model_yaml)
         finally:
             shutil.rmtree(tmpdir)
+
+    def test_model_cache(self):
+        """Test reusing the model when its file is unchanged"""
+
+        # Make a simple model
+        model = _make_simple_model()
+
+        tmpdir = mkdtemp()
+        try:
+            # Save it
+            model_path = os.path.join(tmpdir, 'model.hd5')
+            model.save(model_path)
+
+            # The summary should have one line per line printed by Keras
+            metadata = KerasModel.create_model(model_path, ['y'])
+            summary = []
+            model.summary(print_fn=lambda x: summary.append(x + "\n"))
+            self.assertEqual(''.join(summary), metadata['servable']['model_summary'])
+
+            # The model should not be loaded again if the file is unchanged
+            with patch.object(keras.models, 'load_model',
+                              wraps=keras.models.load_model) as load_model:
+                KerasModel.create_model(model_path, ['y'])
+                load_model.assert_not_called()
+
+                # It should be reloaded after the file changes
+                _make_simple_model().save(model_path)
+                os.utime(model_path, (0, 0))
+                KerasModel.create_model(model_path, ['y'])
+                self.assertEqual(1, load_model.call_count)
+        finally:
+            shutil.rmtree(tmpdir)
@@ -1,9 +1,15 @@
 from unittest import TestCase, skipUnless
+from unittest.mock import Mock, patch
 import os
 
+from funcx.sdk.utils.batch import Batch
+from funcx.serialize import FuncXSerializer
+from globus_sdk import GlobusAPIError
+import requests
+
 from dlhub_sdk.models.servables.python import PythonStaticMethodModel
 from dlhub_sdk.utils.futures import DLHubFuture
-from dlhub_sdk.client import DLHubClient
+from dlhub_sdk.client import DLHubClient, _input_serializer
 
 
 # Check if we are on travis
@@ -15,6 +21,96 @@ is_tag = len(os.environ.get('TRAVIS_TAG', '')) > 1
 is_first_build = os.environ.get('TRAVIS_BUILD_NUMBER', '').endswith('.1')
 
 
+def _make_api_error(status_code):
+    """Make a GlobusAPIError with a certain HTTP status"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b'Error'
+    return GlobusAPIError(response)
+
+
+class TestClientOffline(TestCase):
+    """Tests that do not require logging in to DLHub"""
+
+    def setUp(self):
+        self.dl = DLHubClient.__new__(DLHubClient)
+        self.dl._fx_client = Mock()
+
+    def test_run_many(self):
+        self.dl.fx_cache = {'owner/servable': 'function'}
+        self.dl.fx_endpoint = 'endpoint'
+        self.dl.fx_serializer = FuncXSerializer()
+
+        # Record the inputs of each task, and give each a task ID
+        tasks = {}
+
+        def _batch_run(batch):
+            task_ids = []
+            for task in batch.tasks:
+                args, _ = self.dl.fx_serializer.unpack_buffers(task['payload'])
+                task_ids.append('task{}'.format(len(tasks)))
+                tasks[task_ids[-1]] = _input_serializer.deserialize(args)[0]['data']
+            return task_ids
+        self.dl._fx_client.create_batch.side_effect = Batch
+        self.dl._fx_client.batch_run.side_effect = _batch_run
+
+        # Make futures that return the inputs to the task
+        def _make_future(client, task_id, async_wait):
+            future = Mock()
+            future.result.return_value = tasks[task_id]
+            return future
+
+        with patch('dlhub_sdk.client.DLHubFuture', side_effect=_make_future):
+            # Results should be in the same order as the inputs
+            inputs = list(range(7))
+            self.assertEqual(inputs, self.dl.run_many('owner/servable', inputs, batch_size=3))
+            batches = [len(c[0][0].tasks) for c in self.dl._fx_client.batch_run.call_args_list]
+            self.assertEqual([3, 3, 1], batches)
+
+            # All tasks should go in a single batch by default
+            self.dl._fx_client.batch_run.reset_mock()
+            self.assertEqual(inputs, self.dl.run_many('owner/servable', iter(inputs)))
+            self.assertEqual(1, self.dl._fx_client.batch_run.call_count)
+
+            # No tasks should be submitted without inputs
+            self.dl._fx_client.batch_run.reset_mock()
+            self.assertEqual([], self.dl.run_many('owner/servable', []))
+            self.dl._fx_client.batch_run.assert_not_called()
+
+            # Running a single input should return only its result
+            self.assertEqual({'x': 1}, self.dl.run('owner/servable', {'x': 1}))
+
+        with self.assertRaises(ValueError):
+            self.dl.run_many('owner/servable', inputs, batch_size=0)
+
+    def test_task_statuses_fallback(self):
+        # Use the batch route when available
+        self.dl._fx_client.get_batch_status.return_value = {'a': {'pending': True}}
+        self.assertEqual({'a': {'pending': True}}, self.dl.get_task_statuses(['a']))
+
+        # Fall back to one request per task if the batch route is missing
+        self.dl._fx_client.get_batch_status.side_effect = _make_api_error(404)
+        with patch.object(DLHubClient, 'get_task_status',
+                          side_effect=lambda t: {'task': t}) as get_task_status:
+            statuses = self.dl.get_task_statuses(['a', 'b'])
+        self.assertEqual({'a': {'task': 'a'}, 'b': {'task': 'b'}}, statuses)
+        self.assertEqual(2, get_task_status.call_count)
+
+        # Tasks that fail should be left out without affecting the others
+        def _get_task_status(task_id):
+            if task_id == 'a':
+                raise ValueError('Result Object Deserialization')
+            return {'task': task_id}
+        with patch.object(DLHubClient, 'get_task_status', side_effect=_get_task_status):
+            statuses = self.dl.get_task_statuses(['a', 'b'])
+        self.assertEqual({'b': {'task': 'b'}}, statuses)
+
+        # Other errors should be raised
+        self.dl._fx_client.get_batch_status.side_effect = _make_api_error(500)
+        with self.assertRaises(GlobusAPIError):
+            self.dl.get_task_statuses(['a'])
+
+
 class TestClient(TestCase):
 
     def setUp(self):
@@ -92,6 +188,27 @@ class TestClient(TestCase):
             self.dl.describe_methods('dlhub.test_gmail/1d_norm', 'notamethod')
         self.assertIn('No such method', str(exc.exception))
 
+    def test_lookup_cache(self):
+        # Repeated lookups should be served from the cache
+        description = self.dl.describe_servable('dlhub.test_gmail/1d_norm')
+        self.assertIn(('describe_servable', 'dlhub.test_gmail/1d_norm'), self.dl._search_cache)
+        self.assertEqual(description, self.dl.describe_servable('dlhub.test_gmail/1d_norm'))
+
+        # Modifying the output should not alter the cache
+        description['dlhub']['name'] = 'not_1d_norm'
+        self.assertEqual('1d_norm',
+                         self.dl.describe_servable('dlhub.test_gmail/1d_norm')['dlhub']['name'])
+
+        # Method descriptions should be indexed once and then reused
+        methods = self.dl.describe_methods('dlhub.test_gmail/1d_norm')
+        self.assertIn(('describe_methods', 'dlhub.test_gmail/1d_norm'), self.dl._search_cache)
+        self.assertEqual(methods['run'],
+                         self.dl.describe_methods('dlhub.test_gmail/1d_norm', 'run'))
+
+        # Make sure the cache can be cleared
+        self.dl.invalidate_cache()
+        self.assertEqual({}, self.dl._search_cache)
+
     def test_search_by_servable(self):
         with self.assertRaises(ValueError) as exc:
             self.dl.search_by_servable()
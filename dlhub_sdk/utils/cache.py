@@ -0,0 +1,90 @@
+"""Tools for storing servable metadata on disk between sessions"""
+import json
+import os
+from glob import glob, escape
+from tempfile import mkstemp
+from time import time
+from urllib.parse import quote
+
+from dlhub_sdk.version import __version__
+
+
+def _get_record_path(cache_dir, owner, name):
+    """Get the path to the cache file for a servable
+
+    Args:
+        cache_dir (str): Path to the cache directory
+        owner (str): Owner of the servable
+        name (str): Name of the servable
+    Returns:
+        (str): Path to the cache file
+    """
+    return os.path.join(cache_dir, quote(owner, safe=''), quote(name, safe='') + '.json')
+
+
+def load_cached_record(cache_dir, owner, name, max_age):
+    """Load the metadata for a servable from disk
+
+    Records written by other versions of the SDK are treated as missing.
+
+    Args:
+        cache_dir (str): Path to the cache directory
+        owner (str): Owner of the servable
+        name (str): Name of the servable
+        max_age (float): Maximum age of the record in seconds
+    Returns:
+        (dict) Metadata record for the servable, ``None`` if not found or too old
+    """
+    try:
+        with open(_get_record_path(cache_dir, owner, name)) as fp:
+            entry = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get('sdk_version') != __version__ or time() - entry.get('timestamp', 0) > max_age:
+        return None
+    return entry.get('record')
+
+
+def save_cached_record(cache_dir, owner, name, record):
+    """Save the metadata for a servable to disk
+
+    Args:
+        cache_dir (str): Path to the cache directory
+        owner (str): Owner of the servable
+        name (str): Name of the servable
+        record (dict): Metadata record for the servable
+    """
+    path = _get_record_path(cache_dir, owner, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temporary file first so that readers never see a partial record
+    fp, temp_path = mkstemp(suffix='.json', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fp, 'w') as f:
+            json.dump({'sdk_version': __version__, 'timestamp': time(), 'record': record}, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def remove_cached_records(cache_dir, name, owner=None):
+    """Remove the metadata for a servable from disk
+
+    Args:
+        cache_dir (str): Path to the cache directory
+        name (str): Name of the servable
+        owner (str): Owner of the servable. **Default**: ``None``, to remove servables
+            of this name from all owners
+    """
+    if owner is not None:
+        paths = [_get_record_path(cache_dir, owner, name)]
+    else:
+        paths = glob(os.path.join(escape(cache_dir), '*', quote(name, safe='') + '.json'))
+
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -1,12 +1,35 @@
 """Tools for dealing with asynchronous execution"""
-from globus_sdk import GlobusAPIError
+from globus_sdk import GlobusError
 from concurrent.futures import Future
-from threading import Thread
-from time import sleep
+try:
+    from concurrent.futures import InvalidStateError
+except ImportError:
+    # Futures only check their state before Python 3.8
+    class InvalidStateError(Exception):
+        pass
+from heapq import heappush, heappop
+from itertools import count
+from threading import Thread, Condition, current_thread
+from time import monotonic
+
+# Longest time to wait between status checks, in seconds
+_max_ping_interval = 30
+
+# Futures due to be checked within this many seconds are checked at the same time
+_poll_slack = 0.5
 
 
 class DLHubFuture(Future):
-    """Utility class for simplifying asynchronous execution in DLHub"""
+    """Utility class for simplifying asynchronous execution in DLHub
+
+    The status of all futures is checked by a single background thread, which
+    is started when needed and exits once no futures are left running."""
+
+    # Futures waiting to be checked, as a heap of (time of next check, tiebreaker, future)
+    _poll_queue = []
+    _poll_condition = Condition()
+    _poll_counter = count()
+    _poll_thread = None
 
     def __init__(self, client, task_id: str, ping_interval: float):
         """
@@ -19,6 +42,9 @@ class DLHubFuture(Future):
         self.client = client
         self.task_id = task_id
         self.ping_interval = ping_interval
+        self._interval = ping_interval
+        self._status = None
+        self._last_status = None
 
         # Once you create this, the task has already started
         self.set_running_or_notify_cancel()
@@ -27,19 +53,157 @@ class DLHubFuture(Future):
         if ping_interval < 1:
             assert AttributeError('Ping interval must be at least 1 second')
 
-        # Start a thread that polls status
-        self._checker_thread = Thread(target=DLHubFuture._ping_server, args=(self,))
-        self._checker_thread.start()
+        # Add this task to those being polled
+        self._schedule(self, ping_interval)
+
+    @classmethod
+    def _schedule(cls, future, delay):
+        """Add a future to the polling queue, starting the poller thread if needed
+
+        Args:
+            future (DLHubFuture): Future to be checked
+            delay (float): How long to wait before checking, in seconds
+        """
+        with cls._poll_condition:
+            heappush(cls._poll_queue, (monotonic() + delay, next(cls._poll_counter), future))
+            if cls._poll_thread is None:
+                cls._poll_thread = Thread(target=cls._poll_loop, name='dlhub-future-poller',
+                                          daemon=True)
+                cls._poll_thread.start()
+            cls._poll_condition.notify()
 
-    def _ping_server(self):
+    @classmethod
+    def _poll_loop(cls):
+        """Run the poller, making sure a new poller can be started once this one exits"""
+        try:
+            cls._poll_futures()
+        finally:
+            with cls._poll_condition:
+                if cls._poll_thread is current_thread():
+                    cls._poll_thread = None
+
+    @classmethod
+    def _poll_futures(cls):
+        """Check the status of each future when it is due, until none are left"""
         while True:
-            sleep(self.ping_interval)
+            with cls._poll_condition:
+                if len(cls._poll_queue) == 0:
+                    cls._poll_thread = None
+                    return
+
+                # Wait until the next future is due (or a new future is added)
+                wait = cls._poll_queue[0][0] - monotonic()
+                if wait > 0:
+                    cls._poll_condition.wait(wait)
+                    continue
+
+                # Get all futures that are due, including those due very soon,
+                #  so that their status is requested together
+                cutoff = monotonic() + _poll_slack
+                due = []
+                while len(cls._poll_queue) > 0 and cls._poll_queue[0][0] <= cutoff:
+                    due.append(heappop(cls._poll_queue)[2])
+
+            # Check them outside the lock, with one status request per client
+            by_client = {}
+            for future in due:
+                by_client.setdefault(id(future.client), []).append(future)
+            for futures in by_client.values():
+                try:
+                    statuses = futures[0].client.get_task_statuses([f.task_id for f in futures])
+                    batch_failed = False
+                except GlobusError:
+                    # Keep pinging even if the request fails (e.g., network errors)
+                    statuses = {}
+                    batch_failed = True
+                except Exception as e:
+                    for future in futures:
+                        future._finish(exception=e)
+                    continue
+
+                # Re-add those still running
+                for future in futures:
+                    task = statuses.get(future.task_id)
+                    try:
+                        if task is None and not batch_failed and not future.done():
+                            # Tasks left out of the reply may have failed (e.g., the result
+                            #  could not be deserialized). Request them alone to get the error
+                            try:
+                                task = future.client.get_task_status(future.task_id)
+                            except GlobusError:
+                                pass
+                        delay = future._ping_server(task)
+                    except Exception as e:
+                        future._finish(exception=e)
+                        continue
+                    if delay is not None:
+                        cls._schedule(future, delay)
+
+    def _ping_server(self, task=None):
+        """Update the future given the latest status of the task
+
+        Args:
+            task (dict): Status block from :meth:`DLHubClient.get_task_statuses`.
+                ``None`` if the status is not available
+        Returns:
+            (float) How long to wait before checking again. ``None`` if the task is done
+        """
+        if self.done():
+            return None
+        if task is not None and not self._update_status(task):
+            return None
+
+        # Wait longer between checks while the task stays in the same state
+        if self._last_status is not None and self._status != self._last_status:
+            self._interval = self.ping_interval
+        else:
+            self._interval = min(self._interval * 2,
+                                 max(self.ping_interval, _max_ping_interval))
+        self._last_status = self._status
+        return self._interval
+
+    def _update_status(self, task):
+        """Set the result or exception of the future if the task has finished
+
+        Args:
+            task (dict): Status block for the task
+        Returns:
+            (bool) Whether the task is still running
+        """
+        if not super().running():
+            return False
+        if task.get('pending', True):
+            self._status = task.get('status')
+            return True
+
+        if 'result' in task:
+            if isinstance(task['result'], tuple):
+                self._finish(result=task['result'][0])
+        else:
             try:
-                if not self.running():
-                    break
-            except GlobusAPIError:
-                # Keep pinging even if the results fail
-                continue
+                task['exception'].reraise()
+            except Exception as e:
+                self._finish(exception=e)
+        return False
+
+    def _finish(self, result=None, exception=None):
+        """Set the result or exception of the future, unless it has already finished
+
+        The user may stop the future while the poller is checking its status
+
+        Args:
+            result: Result of the task
+            exception (Exception): Exception raised by the task, if it failed
+        """
+        if self.done():
+            return
+        try:
+            if exception is not None:
+                self.set_exception(exception)
+            else:
+                self.set_result(result)
+        except InvalidStateError:
+            pass
 
     def running(self):
         if super().running():
@@ -51,12 +215,12 @@ class DLHubFuture(Future):
                 if e.args[0] == "Task pending":
                     return True
                 else:
-                    self.set_exception(e)
+                    self._finish(exception=e)
                     return False
 
             if isinstance(status, tuple):
                 # TODO pass in verbose setting?
-                self.set_result(status[0])
+                self._finish(result=status[0])
                 return False
 
         return False
@@ -64,4 +228,4 @@ class DLHubFuture(Future):
     def stop(self):
         """Stop the execution of the function"""
         # TODO (lw): Should be attempt to cancel the execution of the task on DLHub?
-        self.set_exception(Exception('Cancelled by user'))
+        self._finish(exception=Exception('Cancelled by user'))
@@ -1,15 +1,43 @@
 """Utilities for validating against DLHub schemas"""
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
 from jsonschema import Draft7Validator, RefResolver
 import requests
+import json
 
 _schema_repo = "https://raw.githubusercontent.com/DLHub-Argonne/dlhub_schemas/master/schemas/"
 
+# Hashes of documents that have already passed validation, in least-recently-used order
+_validated = OrderedDict()
+_validated_limit = 1024
+_validated_lock = Lock()
+
+
+def _hash_document(document, schema_name):
+    """Compute a hash of a document and the schema it is validated against
+
+    Args:
+        document (dict): Document instance to be validated
+        schema_name (string): Name of schema
+    Returns:
+        (bytes) Hash of the document, ``None`` if it cannot be serialized to JSON
+    """
+    try:
+        content = json.dumps([_schema_repo, schema_name, document], sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return blake2b(content.encode(), digest_size=16).digest()
+
 
 def validate_against_dlhub_schema(document, schema_name):
     """Validate a metadata document against one of the DLHub schemas
 
     Note: Requires an internet connection
 
+    Documents that pass are remembered for the life of the process and are not validated
+    again, even if the schemas are updated in the meantime.
+
     Args:
         document (dict): Document instance to be validated
         schema_name (string): Name of schema (e.g., "dataset" for validating datasets).
@@ -18,6 +46,14 @@ def validate_against_dlhub_schema(document, schema_name):
         (jsonschema.SchemaError) If the schema fails to validate
     """
 
+    # Skip documents that have already been validated
+    doc_hash = _hash_document(document, schema_name)
+    if doc_hash is not None:
+        with _validated_lock:
+            if doc_hash in _validated:
+                _validated.move_to_end(doc_hash)
+                return
+
     # Make the schema validator
     schema = requests.get("{}/{}.json".format(_schema_repo, schema_name)).json()
     validator = Draft7Validator(schema, resolver=RefResolver(_schema_repo, schema))
@@ -25,6 +61,13 @@ def validate_against_dlhub_schema(document, schema_name):
     # Test the document
     validator.validate(document)
 
+    # Remember that it passed
+    if doc_hash is not None:
+        with _validated_lock:
+            _validated[doc_hash] = True
+            if len(_validated) > _validated_limit:
+                _validated.popitem(last=False)
+
 
 def codemeta_to_datacite(metadata):
     """Generate datacite from codemeta metadata
@@ -0,0 +1,53 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import json
+import os
+
+from dlhub_sdk.utils.cache import load_cached_record, save_cached_record, remove_cached_records
+
+
+class TestCache(TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        record = {'dlhub': {'owner': 'owner', 'name': 'model'}}
+        self.assertIsNone(load_cached_record(self.cache_dir, 'owner', 'model', 60))
+
+        save_cached_record(self.cache_dir, 'owner', 'model', record)
+        self.assertEqual(record, load_cached_record(self.cache_dir, 'owner', 'model', 60))
+
+        # Expired records should not be returned
+        self.assertIsNone(load_cached_record(self.cache_dir, 'owner', 'model', -1))
+
+    def test_version_mismatch(self):
+        save_cached_record(self.cache_dir, 'owner', 'model', {'a': 1})
+
+        # Mark the record as coming from a different version of the SDK
+        path = os.path.join(self.cache_dir, 'owner', 'model.json')
+        with open(path) as fp:
+            entry = json.load(fp)
+        entry['sdk_version'] = '0.0.0'
+        with open(path, 'w') as fp:
+            json.dump(entry, fp)
+        self.assertIsNone(load_cached_record(self.cache_dir, 'owner', 'model', 60))
+
+    def test_remove(self):
+        for owner in ['a', 'b']:
+            save_cached_record(self.cache_dir, owner, 'model', {'owner': owner})
+        save_cached_record(self.cache_dir, 'a', 'other', {})
+
+        # Remove a single owner's servable
+        remove_cached_records(self.cache_dir, 'model', owner='a')
+        self.assertIsNone(load_cached_record(self.cache_dir, 'a', 'model', 60))
+        self.assertIsNotNone(load_cached_record(self.cache_dir, 'b', 'model', 60))
+
+        # Remove from all owners
+        remove_cached_records(self.cache_dir, 'model')
+        self.assertIsNone(load_cached_record(self.cache_dir, 'b', 'model', 60))
+        self.assertEqual({}, load_cached_record(self.cache_dir, 'a', 'other', 60))
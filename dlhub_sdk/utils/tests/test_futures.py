@@ -1,11 +1,49 @@
 from dlhub_sdk.utils.futures import DLHubFuture
 from dlhub_sdk.client import DLHubClient
 from unittest import TestCase, expectedFailure
+from unittest.mock import patch
+from globus_sdk import NetworkError
+import threading
 
 # ID of a task that has completed in DLHub
 completed_task = 'b8e51bc6-4081-4ec9-9e3b-b0e52198c08d'
 
 
+class _PendingClient:
+    """Stand-in for DLHubClient where tasks stay pending for a set number of checks"""
+
+    def __init__(self, n_pending):
+        self.n_pending = n_pending
+        self.n_requests = 0
+
+    def get_task_statuses(self, task_ids):
+        self.n_requests += 1
+        if self.n_pending > 0:
+            self.n_pending -= 1
+            return dict((t, {'pending': True, 'status': 'waiting-for-ep'}) for t in task_ids)
+        return dict((t, {'pending': False, 'result': ('done', {})}) for t in task_ids)
+
+
+class _FailingClient:
+    """Stand-in for DLHubClient where status requests fail or omit the task"""
+
+    def __init__(self, error=None, task_errors=None):
+        self.error = error
+        self.task_errors = task_errors or {}
+        self.n_requests = 0
+
+    def get_task_statuses(self, task_ids):
+        self.n_requests += 1
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return dict((t, {'pending': False, 'result': ('done', {})}) for t in task_ids
+                    if t not in self.task_errors)
+
+    def get_task_status(self, task_id):
+        raise self.task_errors[task_id]
+
+
 class TestFutures(TestCase):
 
     @expectedFailure
@@ -15,3 +53,81 @@ class TestFutures(TestCase):
         self.assertFalse(future.running())
         self.assertTrue(future.done())
         self.assertEquals({}, future.result())
+
+    def test_backoff(self):
+        client = _PendingClient(5)
+        future = DLHubFuture(client, 'task', 4)
+
+        # Interval should double while the task is pending, up to the limit
+        intervals = [future._ping_server(client.get_task_statuses(['task'])['task'])
+                     for _ in range(6)]
+        self.assertEqual([8, 16, 30, 30, 30, None], intervals)
+        self.assertEqual('done', future.result(timeout=1))
+
+        # Interval should reset when the status changes
+        future = DLHubFuture(client, 'task', 4)
+        self.assertEqual(8, future._ping_server({'pending': True, 'status': 'waiting-for-ep'}))
+        self.assertEqual(16, future._ping_server({'pending': True, 'status': 'waiting-for-ep'}))
+        self.assertEqual(4, future._ping_server({'pending': True, 'status': 'running'}))
+        future.stop()
+
+    def test_shared_poller(self):
+        client = _PendingClient(1)
+        futures = [DLHubFuture(client, 'task{}'.format(i), 1) for i in range(4)]
+        self.assertEqual(1, sum(t.name == 'dlhub-future-poller' for t in threading.enumerate()))
+
+        # All futures should complete, with one status request for all tasks per check
+        self.assertEqual(['done'] * 4, [f.result(timeout=10) for f in futures])
+        self.assertEqual(2, client.n_requests)
+
+    def test_poller_restart(self):
+        # Make the poller fail
+        with patch.object(DLHubFuture, '_poll_futures', side_effect=RuntimeError()):
+            future = DLHubFuture(_PendingClient(0), 'task', 1)
+            poller = DLHubFuture._poll_thread
+            if poller is not None:
+                poller.join(timeout=5)
+        self.assertIsNone(DLHubFuture._poll_thread)
+
+        # A new poller should start and check both futures
+        new_future = DLHubFuture(_PendingClient(0), 'task', 1)
+        self.assertEqual('done', new_future.result(timeout=10))
+        self.assertEqual('done', future.result(timeout=10))
+
+    def test_stopped_future(self):
+        # A failed status request for a stopped future should not break the poller
+        future = DLHubFuture(_FailingClient(ConnectionError()), 'task', 1)
+        future.stop()
+        new_future = DLHubFuture(_PendingClient(0), 'task', 1)
+        self.assertEqual('done', new_future.result(timeout=10))
+        with self.assertRaises(Exception) as exc:
+            future.result(timeout=1)
+        self.assertEqual('Cancelled by user', str(exc.exception))
+
+        # A stopped future whose status is never available should stop being polled
+        client = _FailingClient(task_errors={'task': NetworkError('Unavailable', None)})
+        future = DLHubFuture(client, 'task', 1)
+        self.assertEqual(2, future._ping_server(None))  # Backs off while status is missing
+        future.stop()
+        self.assertIsNone(future._ping_server(None))
+        new_future = DLHubFuture(_PendingClient(0), 'task', 1)
+        self.assertEqual('done', new_future.result(timeout=10))
+        self.assertLessEqual(client.n_requests, 1)
+
+    def test_failed_status(self):
+        # Network errors should be retried rather than failing the futures
+        client = _FailingClient(error=NetworkError('Connection lost', None))
+        futures = [DLHubFuture(client, 'task{}'.format(i), 1) for i in range(2)]
+        self.assertEqual(['done'] * 2, [f.result(timeout=10) for f in futures])
+
+        # Tasks left out of the batch reply should get the error for only that task
+        client = _FailingClient(task_errors={'bad': ValueError('Result Object Deserialization'),
+                                             'slow': NetworkError('Unavailable', None)})
+        bad = DLHubFuture(client, 'bad', 1)
+        good = DLHubFuture(client, 'good', 1)
+        slow = DLHubFuture(client, 'slow', 1)
+        with self.assertRaises(ValueError):
+            bad.result(timeout=10)
+        self.assertEqual('done', good.result(timeout=10))
+        self.assertFalse(slow.done())
+        slow.stop()
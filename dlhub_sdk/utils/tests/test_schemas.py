@@ -0,0 +1,38 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from jsonschema import ValidationError
+
+from dlhub_sdk.utils import schemas
+from dlhub_sdk.utils.schemas import validate_against_dlhub_schema
+
+_schema = {
+    'type': 'object',
+    'properties': {'name': {'type': 'string'}},
+    'required': ['name']
+}
+
+
+class TestSchemas(TestCase):
+
+    def setUp(self):
+        schemas._validated.clear()
+
+    def test_validation_memo(self):
+        with patch('dlhub_sdk.utils.schemas.requests.get') as get:
+            get.return_value.json.return_value = _schema
+
+            # Validating the same document twice should only fetch the schema once
+            validate_against_dlhub_schema({'name': 'a'}, 'servable')
+            validate_against_dlhub_schema({'name': 'a'}, 'servable')
+            self.assertEqual(1, get.call_count)
+
+            # A changed document should be validated again
+            validate_against_dlhub_schema({'name': 'b'}, 'servable')
+            self.assertEqual(2, get.call_count)
+
+            # Documents that fail validation should not be remembered
+            for _ in range(2):
+                with self.assertRaises(ValidationError):
+                    validate_against_dlhub_schema({'name': 1}, 'servable')
+            self.assertEqual(4, get.call_count)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from dlhub_sdk.utils.search import DLHubSearchHelper, filter_latest
+
+
+class TestSearch(TestCase):
+
+    def test_match_authors_all_terms(self):
+        authors = ['Ward, Logan', 'Blaiszik'] + ['Author{}'.format(i) for i in range(8)]
+
+        # Many required authors should be combined into a single term for each field
+        query = DLHubSearchHelper(search_client=object()).match_authors(authors).current_query()
+        self.assertEqual(1, query.count('datacite.creators.familyName'))
+        self.assertEqual(1, query.count('datacite.creators.givenName'))
+        self.assertIn('("Ward" AND "Blaiszik" AND "Author0"', query)
+
+        # Matching any author still requires a group per author
+        query = DLHubSearchHelper(search_client=object()).match_authors(authors, match_all=False)\
+            .current_query()
+        self.assertEqual(len(authors), query.count('datacite.creators.familyName'))
+
+    def test_filter_latest(self):
+        # Make several versions of many servables, including ties and dates stored as strings
+        results = []
+        for i in range(100):
+            for date in [i % 7, (i * 3) % 5, i % 7]:
+                results.append({'dlhub': {'shorthand_name': 'owner/servable{}'.format(i % 30),
+                                          'publication_date': str(date), 'id': len(results)}})
+        results.append({'dlhub': {'shorthand_name': 'owner/undated'}})
+
+        # Entries without a publication date should be skipped with a warning
+        with self.assertWarns(RuntimeWarning):
+            latest = filter_latest(results)
+
+        # Make sure the results are correct
+        self.assertEqual(30, len(latest))
+        for res in latest:
+            name = res['dlhub']['shorthand_name']
+            versions = [r for r in results[:-1] if r['dlhub']['shorthand_name'] == name]
+            newest = max(int(r['dlhub']['publication_date']) for r in versions)
+            self.assertEqual(newest, int(res['dlhub']['publication_date']))
@@ -20,6 +20,7 @@ setup(
     install_requires=[
         "pandas",
         "requests>=2.20.0",
+        "requests_toolbelt>=0.9.1",
         "jsonschema>=3.0.0",
         "globus_sdk",
         "jsonpickle",